@@ -1,22 +1,34 @@
+import uuid
 import streamlit as st
 import pandas as pd
 from components import (
     inject_global_css,
     styled_header,
     styled_file_uploader,
+    styled_delta_uploader,
     data_preview,
     create_analysis_tabs,
     plot_distribution,
     plot_statistical_details,
-    styled_variable_type_selector
+    styled_variable_type_selector,
+    report_export_panel,
+    memory_usage_panel,
+    filter_panel
 )
 
 from utils import (
     classify_variable,
     calculate_frequencies,
-    calculate_statistics
+    calculate_statistics,
+    generate_interpretation,
+    load_csv,
+    drop_missing
 )
 
+from dataset_manager import DatasetManager
+from incremental import IncrementalDataset
+from filters import CategoryBitmapIndex
+
 # ==============================================
 # CONFIGURAÇÃO INICIAL
 # ==============================================
@@ -46,14 +58,25 @@ def main():
     
     # Upload de dados
     uploaded_file = styled_file_uploader()
+    arrow_backend = st.sidebar.toggle(
+        "Modo Arrow (zero-copy)",
+        key="arrow_backend",
+        help="Mantém os dados em buffers Arrow da leitura do CSV até a exibição"
+    )
     
-    if not uploaded_file:
-        df = pd.read_csv("datas.csv", decimal=",")
-    else:
-        # Carrega e exibe dados
-        df = pd.read_csv(uploaded_file, decimal=",")
-    
-    df = df.iloc[:, 1:]
+    # Carrega os dados (uma vez por sessão, dentro do orçamento de memória)
+    manager, session_id, df = load_dataset(uploaded_file, arrow_backend)
+
+    # Anexa arquivos de atualização sem recalcular o que já foi calculado
+    incremental, df = apply_deltas(manager, session_id, df, styled_delta_uploader(), arrow_backend)
+    memory_usage_panel(manager.usage(session_id))
+
+    # Filtros por categoria resolvidos nos bitmaps pré-calculados
+    filter_index = get_filter_index(df)
+    filter_bits = filter_index.combine(filter_panel(filter_index))
+
+    if filter_bits is not None:
+        st.sidebar.caption(f"{filter_index.count(filter_bits)} de {len(df)} linhas selecionadas pelos filtros")
         
     data_preview(df)
     
@@ -64,11 +87,21 @@ def main():
         if st.sidebar.checkbox(col, key=f"checkbox_{col}")
     ]
     
+    # Resultados já calculados, reaproveitados na exportação do relatório
+    results = {}
+
     # Análise para cada variável selecionada
     for col in selected_columns:
 
         st.markdown(f"---\n## Variável: `{col}`")
-        col_data = df[col].dropna()
+
+        # Com filtro ativo, a máscara (que já exclui ausentes) vai direto para os cálculos
+        mask = filter_index.column_mask(col, filter_bits) if filter_bits is not None else None
+        col_data = df[col] if mask is not None else drop_missing(df[col])
+
+        if mask is not None and not mask.any():
+            st.warning("Nenhuma linha com valor nesta variável atende aos filtros selecionados")
+            continue
         
         # Classificação da variável
         var_type = styled_variable_type_selector(classify_variable(col_data), key=f"selectbox_{col}")
@@ -76,36 +109,141 @@ def main():
         # Abas de análise
         tab_freq, tab_viz, tab_stats = create_analysis_tabs()
         
+        result = results[col] = {'var_type': var_type, 'stats': None, 'interpretation': []}
+
+        # Após anexar atualizações, as tabelas vêm do estado incremental da coluna
+        # (o estado cobre o dataset inteiro, então não vale com filtro ativo)
+        use_accumulator = incremental.applied and mask is None
+        accumulator = incremental.accumulator(col) if use_accumulator else None
+
         # Tab 1: Tabela de Frequência
         with tab_freq:
-            freq_info = calculate_frequencies(col_data, var_type)
+            if accumulator:
+                freq_info = accumulator.frequencies(var_type, col_data)
+            else:
+                freq_info = calculate_frequencies(col_data, var_type, mask=mask)
             st.write(freq_info['freq_table'])
+            result['freq_table'] = freq_info['freq_table']
         
         # Tab 2: Visualização Gráfica
         with tab_viz:
-            plot_distribution(freq_info, col)
+            result['figures'] = [plot_distribution(freq_info, col)]
             if var_type.startswith("Quantitativa"):
-                plot_statistical_details(col_data, col)
+                result['figures'].append(plot_statistical_details(freq_info['plot_data'], col))
         
         # Tab 3: Análise Estatística
         with tab_stats:
             if var_type.startswith("Quantitativa"):
-                show_statistical_analysis(col_data, col)
+                if accumulator:
+                    result['stats'] = accumulator.statistics()
+                else:
+                    result['stats'] = calculate_statistics(col_data, mask=mask)
+                result['interpretation'] = show_statistical_analysis(result['stats'], col)
             else:
                 st.warning("Análise estatística disponível apenas pra variáveis quantitativas")
 
+    # Exportação em segundo plano, sem recalcular nada
+    report_export_panel(results)
+
 # ==============================================
 # FUNÇÕES AUXILIARES
 # ==============================================
 
-def show_statistical_analysis(col_data, col_name):
+@st.cache_resource
+def get_dataset_manager():
+
+    """Gerenciador de memória compartilhado por todas as sessões do servidor"""
+
+    return DatasetManager()
+
+def load_dataset(uploaded_file, arrow_backend=False):
+
+    """
+    Carrega o CSV enviado (ou o de exemplo) sob o controle do gerenciador de memória.
+    Com arrow_backend=True os dados usam dtypes pyarrow (ver utils.load_csv).
+    O arquivo só é lido na primeira execução; nas seguintes o DataFrame vem do gerenciador.
+    Retorna: (gerenciador, id da sessão, DataFrame)
+    """
+
+    manager = get_dataset_manager()
+    session_id = st.session_state.setdefault('session_id', uuid.uuid4().hex)
+    dataset_key = uploaded_file.file_id if uploaded_file else "datas.csv"
+    if arrow_backend:
+        dataset_key += ":arrow"
+
+    # Um novo upload substitui o anterior da sessão
+    previous_key = st.session_state.get('dataset_key')
+    if previous_key is not None and previous_key != dataset_key:
+        manager.drop(session_id, previous_key)
+    st.session_state['dataset_key'] = dataset_key
+
+    df = manager.get(session_id, dataset_key)
+
+    if df is None:
+        if uploaded_file:
+            uploaded_file.seek(0)
+        df = manager.put(session_id, dataset_key, load_csv(uploaded_file or "datas.csv", arrow_backend))
+
+    return manager, session_id, df
+
+def apply_deltas(manager, session_id, df, delta_files, arrow_backend=False):
+
+    """
+    Anexa ao dataset da sessão os arquivos de atualização ainda não aplicados.
+    Retorna: (estado incremental, DataFrame atualizado)
+    """
+
+    dataset_key = st.session_state['dataset_key']
+    incremental = st.session_state.get('incremental')
+
+    # Dataset trocado ou recarregado do arquivo base: o estado recomeça e as
+    # atualizações são reaplicadas (os acumuladores nascem no primeiro arquivo)
+    if incremental is None or not incremental.is_current(dataset_key, df):
+        incremental = st.session_state['incremental'] = IncrementalDataset(dataset_key, df)
+
+    for delta_file in delta_files or []:
+        if delta_file.file_id in incremental.applied:
+            continue
+
+        delta_file.seek(0)
+
+        try:
+            df = incremental.append(df, load_csv(delta_file, arrow_backend), delta_file.file_id)
+        except ValueError as error:
+            st.sidebar.error(f"{delta_file.name}: {error}")
+            continue
+
+        df = manager.put(session_id, dataset_key, df)
+
+    # Os acumuladores ficam no session_state e contam no orçamento da sessão
+    manager.track_state(session_id, dataset_key, incremental.nbytes)
+
+    return incremental, df
+
+def get_filter_index(df):
+
+    """
+    Índice de bitmaps do dataset da sessão: montado na carga e estendido
+    apenas com as linhas anexadas depois.
+    """
+
+    dataset_key = st.session_state['dataset_key']
+    filter_index = st.session_state.get('filter_index')
+
+    if filter_index is None or not filter_index.is_current(dataset_key, df):
+        filter_index = st.session_state['filter_index'] = CategoryBitmapIndex(dataset_key, df)
+    elif filter_index.n < len(df):
+        filter_index.extend(df.iloc[filter_index.n:])
+
+    return filter_index
+
+def show_statistical_analysis(stats, col_name):
 
     """
     Exibe as estatísticas em tabelas simples no Streamlit com dados centralizados e cabeçalho colorido
+    Retorna: frases de interpretação exibidas
     """
 
-    stats = calculate_statistics(col_data)
-    
     # Tabela de Medidas de Posição
     df_posicao = pd.DataFrame.from_dict(
         stats['Medidas de Posição'], 
@@ -132,33 +270,18 @@ def show_statistical_analysis(col_data, col_name):
     df_dispersao_styled = df_dispersao.style.set_properties(**{'text-align': 'center'})
     st.dataframe(df_dispersao_styled)
 
-    interpret_statistics(stats, col_name)
+    return interpret_statistics(stats, col_name)
 
 def interpret_statistics(stats, col_name):
-    media = stats["Medidas de Posição"].get("Média", None)
-    mediana = stats["Medidas de Posição"].get("Mediana", None)
-    moda = stats["Medidas de Posição"].get("Moda", None)
-    desvio = stats["Medidas de Dispersão"].get("Desvio Padrão", None)
-    amplitude = stats["Medidas de Dispersão"].get("Amplitude", None)
+
+    frases = generate_interpretation(stats, col_name)
 
     st.markdown("### 🧠 Interpretação dos Dados")
-    
-    if media and mediana:
-        if abs(media - mediana) < 0.1 * media:
-            st.write(f"A média e a mediana da variável **{col_name}** são próximas ({media:.2f} e {mediana:.2f}), indicando uma distribuição aproximadamente simétrica.")
-        elif media > mediana:
-            st.write(f"A média ({media:.2f}) é maior que a mediana ({mediana:.2f}), sugerindo que a distribuição da variável **{col_name}** pode estar **assimétrica à direita**.")
-        else:
-            st.write(f"A média ({media:.2f}) é menor que a mediana ({mediana:.2f}), sugerindo que a distribuição da variável **{col_name}** pode estar **assimétrica à esquerda**.")
-
-    if desvio:
-        st.write(f"O desvio padrão é de **{desvio:.2f}**, o que indica o grau de dispersão dos dados em relação à média.")
-
-    if amplitude:
-        st.write(f"A amplitude total dos dados é de **{amplitude:.2f}**, representando a diferença entre o maior e o menor valor observado.")
-    
-    if moda is not None:
-        st.write(f"A moda dos dados é **{moda}**, ou seja, o valor que ocorre com mais frequência na variável **{col_name}**.")
+
+    for frase in frases:
+        st.write(frase)
+
+    return frases
 
 # ==============================================
 # EXECUÇÃO
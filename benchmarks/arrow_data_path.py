@@ -0,0 +1,140 @@
+"""
+Benchmark do caminho dos dados: modo padrão (NumPy) x modo Arrow (dtypes pyarrow).
+
+Para cada etapa (carga, serialização do st.dataframe, classificação, frequências
+e estatísticas) mede o tempo e os bytes alocados (NumPy/Python via tracemalloc
+e Arrow via pa.total_allocated_bytes).
+
+A coluna "Alocado/entrada" é uma razão de bytes (alocado / tamanho dos dados de
+entrada da etapa), não uma contagem de conversões: 1.00 equivale em volume a uma
+cópia completa da entrada, mas pode vir de várias alocações menores.
+
+Uso:
+    python benchmarks/arrow_data_path.py --linhas 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils import (  # noqa: E402
+    load_csv,
+    drop_missing,
+    classify_variable,
+    calculate_frequencies,
+    calculate_statistics
+)
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "datas.csv")
+
+# ==============================================
+# MEDIÇÃO
+# ==============================================
+
+def measure(func, *args):
+
+    """Executa func e devolve (resultado, segundos, bytes alocados em NumPy/Python + Arrow)"""
+
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.reset_peak()
+    python_before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+
+    result = func(*args)
+
+    elapsed = time.perf_counter() - start
+    python_peak = tracemalloc.get_traced_memory()[1] - python_before
+    arrow_growth = max(pa.total_allocated_bytes() - arrow_before, 0)
+
+    return result, elapsed, python_peak + arrow_growth
+
+def run_mode(path, arrow_backend):
+
+    """Percorre o fluxo do app para todas as colunas; devolve {etapa: [segundos, bytes, bytes de entrada]}"""
+
+    stages = {}
+
+    def record(stage, elapsed, allocated, input_bytes):
+        total = stages.setdefault(stage, [0.0, 0, 0])
+        total[0] += elapsed
+        total[1] += allocated
+        total[2] += input_bytes
+
+    df, elapsed, allocated = measure(load_csv, path, arrow_backend)
+    df_bytes = int(df.memory_usage(deep=True).sum())
+    record("carga", elapsed, allocated, df_bytes)
+
+    # O st.dataframe serializa o DataFrame para Arrow antes de enviá-lo ao navegador
+    _, elapsed, allocated = measure(pa.Table.from_pandas, df)
+    record("serialização (st.dataframe)", elapsed, allocated, df_bytes)
+
+    for col in df.columns:
+        col_data = drop_missing(df[col])
+        col_bytes = int(col_data.memory_usage(deep=True, index=False))
+
+        var_type, elapsed, allocated = measure(classify_variable, col_data)
+        record("classify_variable", elapsed, allocated, col_bytes)
+
+        _, elapsed, allocated = measure(calculate_frequencies, col_data, var_type)
+        record("calculate_frequencies", elapsed, allocated, col_bytes)
+
+        if var_type.startswith("Quantitativa"):
+            _, elapsed, allocated = measure(calculate_statistics, col_data)
+            record("calculate_statistics", elapsed, allocated, col_bytes)
+
+    return stages
+
+# ==============================================
+# EXECUÇÃO
+# ==============================================
+
+def build_dataset(rows):
+
+    """Replica o CSV de exemplo até o número de linhas pedido"""
+
+    base = pd.read_csv(DATASET, dtype=str, keep_default_na=False)
+    repeated = base.loc[base.index.repeat(-(-rows // len(base)))].head(rows)
+
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    os.close(handle)
+    repeated.to_csv(path, index=False)
+
+    return path
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=200_000, help="Número de linhas do CSV sintético")
+    args = parser.parse_args()
+
+    path = build_dataset(args.linhas)
+    tracemalloc.start()
+
+    try:
+        results = {
+            "NumPy": run_mode(path, arrow_backend=False),
+            "Arrow": run_mode(path, arrow_backend=True)
+        }
+    finally:
+        tracemalloc.stop()
+        os.remove(path)
+
+    print(f"Linhas: {args.linhas}\n")
+    print(f"{'Etapa':<30}{'Modo':<8}{'Tempo (ms)':>12}{'Alocado (MB)':>15}{'Alocado/entrada':>17}")
+
+    for stage in results["NumPy"]:
+        for mode, stages in results.items():
+            elapsed, allocated, input_bytes = stages[stage]
+            ratio = allocated / input_bytes if input_bytes else float("nan")
+            print(f"{stage:<30}{mode:<8}{elapsed * 1000:>12.1f}{allocated / 2**20:>15.2f}{ratio:>17.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from report import submit_report, results_signature, FORMATO_HTML, FORMATO_ZIP
 
 # ==============================================
 # CSS GLOBAL
@@ -116,6 +117,79 @@ def styled_file_uploader():
 
     return st.sidebar.file_uploader("Faça upload de um arquivo CSV", type="csv")
 
+def styled_delta_uploader():
+
+    """Uploader de arquivos de atualização (novas linhas com as mesmas colunas)"""
+
+    return st.sidebar.file_uploader(
+        "Anexar novas linhas (CSV)",
+        type="csv",
+        accept_multiple_files=True,
+        key="delta_files",
+        help="Cada arquivo é anexado uma única vez ao dataset carregado; "
+             "remover o arquivo daqui não desfaz a anexação."
+    )
+
+# ==============================================
+# FILTROS
+# ==============================================
+
+def filter_panel(filter_index):
+
+    """
+    Filtros por categoria das variáveis qualitativas, no sidebar.
+    Retorna: {coluna: [categorias selecionadas]}
+    """
+
+    selection = {}
+
+    with st.sidebar.expander("Filtros", expanded=False):
+        for col in filter_index.bitmaps:
+            selection[col] = st.multiselect(
+                col,
+                options=filter_index.categories(col),
+                key=f"filter_{col}"
+            )
+
+    return selection
+
+# ==============================================
+# USO DE MEMÓRIA
+# ==============================================
+
+def memory_usage_panel(usage):
+
+    """Contabilidade de memória dos datasets carregados, exibida no sidebar"""
+
+    st.sidebar.markdown("### Uso de memória")
+
+    st.sidebar.progress(
+        min(usage['session_bytes'] / usage['session_budget'], 1.0),
+        text=f"Sessão: {_format_mb(usage['session_bytes'])} de {_format_mb(usage['session_budget'])}"
+    )
+    st.sidebar.progress(
+        min(usage['global_bytes'] / usage['global_budget'], 1.0),
+        text=f"Servidor: {_format_mb(usage['global_bytes'])} de {_format_mb(usage['global_budget'])}"
+    )
+    st.sidebar.caption(
+        f"{usage['resident_datasets']} dataset(s) em memória · "
+        f"{usage['mapped_datasets']} lido(s) do disco ({_format_mb(usage['mapped_bytes'])}) · "
+        f"{usage['spilled_datasets']} em disco ({_format_mb(usage['spilled_bytes'])})"
+    )
+
+    if usage['session_state_bytes']:
+        st.sidebar.caption(f"Estado das atualizações incrementais: {_format_mb(usage['session_state_bytes'])}")
+
+    if usage['session_mapped_bytes']:
+        st.sidebar.warning(
+            f"O dataset desta sessão ({_format_mb(usage['session_mapped_bytes'])}) não cabe no "
+            "orçamento de memória e está sendo lido direto do disco, o que pode deixar a análise mais lenta."
+        )
+
+def _format_mb(nbytes):
+
+    return f"{nbytes / (1024 * 1024):.1f} MB"
+
 # ==============================================
 # SELECT ESCOLHER O TIPO DE VARIAVEL
 # ==============================================
@@ -186,6 +260,7 @@ def data_preview(df):
 
     if show_table:
         with st.container():
+            # Com dtypes pyarrow (modo Arrow) a serialização reaproveita os buffers, sem conversão
             st.dataframe(df, height=300)
     else:
         st.info("Tabela ocultada. Marque a opção 'Mostrar tabela de dados' no sidebar para visualizar.")
@@ -245,6 +320,9 @@ def plot_distribution(plot_info, col_name):
             - 'freq_table': Tabela de frequências (para quantitativas)
             - 'bins': Intervalos dos bins (para quantitativas)
         col_name (str): Nome da coluna/variável
+
+    Retorna:
+        go.Figure: a figura exibida, para ser reaproveitada (ex: relatório exportado)
     """
     
     # =============================================
@@ -262,13 +340,27 @@ def plot_distribution(plot_info, col_name):
     </style>
     """
     st.markdown(container_style, unsafe_allow_html=True)
+
+    fig = build_distribution_figure(plot_info, col_name)
+    
+    with st.container():
+        st.plotly_chart(fig, use_container_width=True)
+
+    return fig
+
+def build_distribution_figure(plot_info, col_name):
+
+    """Monta a figura de distribuição sem exibi-la (usada na tela e no relatório)"""
     
     # =============================================
     # Variáveis Qualitativas
     # =============================================
     if plot_info['var_type'].startswith("Qualitativa"):
-        df_counts = plot_info['plot_data'].value_counts().reset_index()
+        # Reaproveita a contagem da tabela de frequências (sem a linha de total)
+        freq = plot_info['freq_table']['Frequência Absoluta'].iloc[:-1]
+        df_counts = freq.sort_values(ascending=False, kind="stable").reset_index()
         df_counts.columns = [col_name, "Frequência"]
+        df_counts[col_name] = df_counts[col_name].astype(str)
         
         fig = px.bar(
             df_counts,
@@ -368,9 +460,8 @@ def plot_distribution(plot_info, col_name):
         font=dict(color='white'),
         margin=dict(l=20, r=20, t=60, b=20)
     )
-    
-    with st.container():
-        st.plotly_chart(fig, use_container_width=True)
+
+    return fig
 
 def plot_statistical_details(col_data, col_name):
 
@@ -378,4 +469,76 @@ def plot_statistical_details(col_data, col_name):
 
     fig = px.box(col_data, points="all", title=f"Detalhes Estatísticos - {col_name}")
     fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    return fig
+
+# ==============================================
+# EXPORTAR RELATÓRIO
+# ==============================================
+
+def report_export_panel(results):
+
+    """
+    Painel do sidebar para exportar o relatório.
+    O arquivo é montado em segundo plano a partir dos resultados já calculados na tela.
+    """
+
+    st.sidebar.markdown("### Exportar relatório")
+
+    formato = st.sidebar.radio("Formato", [FORMATO_HTML, FORMATO_ZIP], key="report_format")
+    static_images = st.sidebar.checkbox(
+        "Gráficos como imagens estáticas",
+        key="report_static_images",
+        help="Gera arquivos menores, mas sem interatividade (requer kaleido>=1 e o Google Chrome instalado)"
+    )
+
+    signature = results_signature(results)
+
+    if st.sidebar.button("Gerar relatório", disabled=not results, key="report_button"):
+        st.session_state['report_job'] = submit_report(results, formato, static_images)
+        st.session_state['report_signature'] = signature
+
+    # Seleção, tipos ou dados mudaram: o relatório gerado não vale mais
+    if st.session_state.get('report_signature') != signature:
+        st.session_state.pop('report_job', None)
+
+    job = st.session_state.get('report_job')
+
+    if job is None:
+        if not results:
+            st.sidebar.caption("Selecione ao menos uma variável para gerar o relatório.")
+        return
+
+    # Enquanto o relatório é gerado, apenas este trecho é reexecutado periodicamente
+    polling = not job.done()
+    st.session_state['report_polling'] = polling
+
+    with st.sidebar:
+        st.fragment(run_every=1 if polling else None)(_report_status)()
+
+def _report_status():
+
+    job = st.session_state['report_job']
+
+    if not job.done():
+        st.info("⏳ Gerando relatório em segundo plano...")
+        return
+
+    # Terminou durante a consulta periódica: um único rerun encerra o polling
+    if st.session_state.get('report_polling'):
+        st.session_state['report_polling'] = False
+        st.rerun()
+
+    if job.exception() is not None:
+        st.error(f"Falha ao gerar o relatório: {job.exception()}")
+        return
+
+    arquivo = job.result()
+    st.download_button(
+        "📥 Baixar relatório",
+        data=arquivo['data'],
+        file_name=arquivo['file_name'],
+        mime=arquivo['mime'],
+        key="report_download"
+    )
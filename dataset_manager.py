@@ -0,0 +1,274 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# ==============================================
+# ORÇAMENTOS DE MEMÓRIA
+# ==============================================
+
+MB = 1024 * 1024
+
+# Podem ser ajustados no deploy via variáveis de ambiente
+GLOBAL_BUDGET = int(os.environ.get("ANALISE_MEMORIA_GLOBAL_MB", 1024)) * MB
+SESSION_BUDGET = int(os.environ.get("ANALISE_MEMORIA_SESSAO_MB", 256)) * MB
+
+# Sessões sem acesso por mais tempo que isso têm seus dados descartados
+SESSION_TTL = int(os.environ.get("ANALISE_SESSAO_TTL_MIN", 60)) * 60
+
+# ==============================================
+# GERENCIADOR DE DATASETS
+# ==============================================
+
+class DatasetManager:
+
+    """
+    Mantém os DataFrames carregados por todas as sessões do servidor dentro de
+    um orçamento global e de um orçamento por sessão.
+
+    Quando um orçamento é ultrapassado, os datasets menos usados recentemente
+    são gravados em arquivos Arrow (IPC) no disco e liberados da memória.
+    Um get() posterior os recarrega via memory map, de forma transparente.
+
+    Se o dataset em uso, sozinho, não cabe no orçamento, ele passa a ser lido
+    direto do arquivo mapeado (dtypes pyarrow, sem cópia para a RAM).
+
+    Estado derivado de um dataset que fica na memória da sessão (ex: os
+    acumuladores incrementais) é registrado com track_state() e conta nos
+    orçamentos, embora não possa ser gravado em disco.
+
+    Os DataFrames devolvidos são compartilhados: quem os recebe não deve alterá-los.
+    """
+
+    def __init__(self, global_budget=GLOBAL_BUDGET, session_budget=SESSION_BUDGET,
+                 session_ttl=SESSION_TTL, spill_dir=None):
+
+        self.global_budget = global_budget
+        self.session_budget = session_budget
+        self.session_ttl = session_ttl
+
+        if spill_dir is None:
+            spill_dir = tempfile.mkdtemp(prefix="analise_spill_")
+
+            # O diretório temporário é apagado junto com o gerenciador (ou na saída do processo)
+            weakref.finalize(self, shutil.rmtree, spill_dir, ignore_errors=True)
+
+        self.spill_dir = spill_dir
+
+        # (session_id, name) -> entrada; a ordem do dicionário é a ordem LRU
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    # -------------------------------
+    # API PÚBLICA
+    # -------------------------------
+    def put(self, session_id, name, df):
+
+        """Registra (ou substitui) um dataset da sessão e aplica os orçamentos"""
+
+        with self._lock:
+            self.drop(session_id, name)
+
+            key = (session_id, name)
+            self._entries[key] = {
+                'df': df,
+                'nbytes': int(df.memory_usage(deep=True).sum()),
+                'path': None,
+                'arrow_backed': any(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes),
+                'mapped': False,
+                'state_bytes': 0,
+                'last_access': time.monotonic()
+            }
+
+            self._enforce(key)
+
+            # Pode ter virado um DataFrame mapeado do disco (ver _enforce)
+            return self._entries[key]['df']
+
+    def get(self, session_id, name):
+
+        """Devolve o dataset da sessão (recarregando do disco se necessário) ou None"""
+
+        with self._lock:
+            key = (session_id, name)
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            if entry['df'] is None:
+                self._reload(entry)
+
+            entry['last_access'] = time.monotonic()
+            self._entries.move_to_end(key)
+            self._enforce(key)
+
+            return entry['df']
+
+    def track_state(self, session_id, name, nbytes):
+
+        """Registra os bytes do estado derivado do dataset (substitui o valor anterior)"""
+
+        with self._lock:
+            key = (session_id, name)
+            entry = self._entries.get(key)
+
+            if entry is None or entry['state_bytes'] == nbytes:
+                return
+
+            entry['state_bytes'] = nbytes
+            self._enforce(key)
+
+    def drop(self, session_id, name):
+
+        """Remove o dataset da memória e do disco"""
+
+        with self._lock:
+            entry = self._entries.pop((session_id, name), None)
+            if entry is not None:
+                self._remove_file(entry)
+
+    def release_session(self, session_id):
+
+        """Remove todos os datasets de uma sessão"""
+
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == session_id]:
+                self.drop(*key)
+
+    def usage(self, session_id=None):
+
+        """
+        Contabilidade de memória atual.
+
+        Retorna: Dicionário com bytes em memória (global e da sessão, incluindo o
+        estado registrado com track_state), orçamentos, bytes gravados em disco,
+        bytes lidos direto do disco (memory map) e quantidade de datasets em cada situação
+        """
+
+        with self._lock:
+            entries = self._entries.items()
+            resident = [(k, e) for k, e in entries if e['df'] is not None and not e['mapped']]
+            mapped = [(k, e) for k, e in entries if e['mapped']]
+            spilled = [(k, e) for k, e in entries if e['df'] is None]
+
+            return {
+                'global_bytes': self._resident_bytes(),
+                'global_budget': self.global_budget,
+                'session_bytes': self._resident_bytes(session_id),
+                'session_budget': self.session_budget,
+                'session_state_bytes': sum(e['state_bytes'] for k, e in entries if k[0] == session_id),
+                'session_mapped_bytes': sum(e['nbytes'] for k, e in mapped if k[0] == session_id),
+                'mapped_bytes': sum(e['nbytes'] for _, e in mapped),
+                'spilled_bytes': sum(os.path.getsize(e['path']) for _, e in spilled),
+                'resident_datasets': len(resident),
+                'mapped_datasets': len(mapped),
+                'spilled_datasets': len(spilled)
+            }
+
+    # -------------------------------
+    # APLICAÇÃO DOS ORÇAMENTOS
+    # -------------------------------
+    def _enforce(self, keep):
+
+        """Descarta sessões expiradas e grava em disco os datasets LRU até caber nos orçamentos"""
+
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if now - e['last_access'] > self.session_ttl]:
+            if key != keep:
+                self.drop(*key)
+
+        # Orçamento da sessão que acabou de usar memória
+        while self._resident_bytes(keep[0]) > self.session_budget:
+            if not self._spill_lru(keep, session_id=keep[0]):
+                break
+
+        # Orçamento global do processo
+        while self._resident_bytes() > self.global_budget:
+            if not self._spill_lru(keep):
+                break
+
+        # Nada mais a liberar e o próprio dataset em uso não cabe: passa a ser
+        # lido do arquivo mapeado em vez de ocupar a RAM
+        entry = self._entries[keep]
+        over_budget = (
+            self._resident_bytes(keep[0]) > self.session_budget
+            or self._resident_bytes() > self.global_budget
+        )
+
+        if over_budget and not entry['mapped']:
+            self._spill(entry)
+            self._reload(entry, arrow_backed=True)
+
+    def _resident_bytes(self, session_id=None):
+
+        # Datasets mapeados do disco ficam no cache de páginas do sistema, não na RAM do processo;
+        # o estado derivado fica sempre em memória
+        return sum(
+            (e['nbytes'] if e['df'] is not None and not e['mapped'] else 0) + e['state_bytes']
+            for k, e in self._entries.items()
+            if session_id is None or k[0] == session_id
+        )
+
+    def _spill_lru(self, keep, session_id=None):
+
+        """Grava em disco o dataset residente menos usado; False se não houver candidato"""
+
+        for key, entry in self._entries.items():
+            if key == keep or entry['df'] is None or entry['mapped']:
+                continue
+            if session_id is not None and key[0] != session_id:
+                continue
+
+            self._spill(entry)
+            return True
+
+        return False
+
+    # -------------------------------
+    # DISCO (ARROW IPC)
+    # -------------------------------
+    def _spill(self, entry):
+
+        # O arquivo de um dataset não alterado é reaproveitado entre spills
+        if entry['path'] is None:
+            path = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.arrow")
+            table = pa.Table.from_pandas(entry['df'], preserve_index=None)
+
+            with pa.OSFile(path, "wb") as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+            entry['path'] = path
+
+        entry['df'] = None
+        entry['mapped'] = False
+
+    def _reload(self, entry, arrow_backed=None):
+
+        if arrow_backed is None:
+            arrow_backed = entry['arrow_backed']
+
+        source = pa.memory_map(entry['path'], "r")
+        table = ipc.open_file(source).read_all()
+
+        # Com dtypes pyarrow o DataFrame aponta direto para o arquivo mapeado (sem cópia)
+        if arrow_backed:
+            entry['df'] = table.to_pandas(types_mapper=pd.ArrowDtype)
+            entry['mapped'] = True
+        else:
+            entry['df'] = table.to_pandas()
+            entry['mapped'] = False
+
+    def _remove_file(self, entry):
+
+        if entry['path'] is not None and os.path.exists(entry['path']):
+            os.remove(entry['path'])
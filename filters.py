@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+# Colunas qualitativas com mais categorias que isso não ganham índice
+# (ex: identificadores ou texto livre), pois o filtro deixaria de ser útil
+MAX_CATEGORIES = 50
+
+# ==============================================
+# ÍNDICE DE BITMAPS POR CATEGORIA
+# ==============================================
+
+class CategoryBitmapIndex:
+
+    """
+    Índice de filtros montado uma única vez na carga dos dados.
+
+    Para cada categoria das colunas qualitativas guarda um bitmap compactado
+    (np.packbits: 1 bit por linha), além de um bitmap de valores presentes
+    para todas as colunas. Um filtro é resolvido só com operações bit a bit
+    (OU entre categorias da mesma coluna, E entre colunas) sobre n/8 bytes,
+    sem reler nem refiltrar o DataFrame.
+    """
+
+    def __init__(self, dataset_key, df):
+
+        self.dataset_key = dataset_key
+        self.n = 0
+
+        # coluna -> {categoria: bitmap}
+        self.bitmaps = {}
+
+        # coluna -> bitmap das linhas sem valor ausente
+        self.not_null = {col: np.empty(0, dtype=np.uint8) for col in df.columns}
+
+        for col in df.columns:
+            if not pd.api.types.is_numeric_dtype(df[col]) and df[col].nunique() <= MAX_CATEGORIES:
+                self.bitmaps[col] = {}
+
+        self.extend(df)
+
+    def is_current(self, dataset_key, df):
+
+        """False se o dataset foi trocado ou recarregado (com menos linhas que o índice)"""
+
+        return self.dataset_key == dataset_key and self.n <= len(df)
+
+    def extend(self, new_rows):
+
+        """Indexa linhas anexadas ao final do dataset (ex: arquivos de atualização)"""
+
+        for col, bitmaps in self.bitmaps.items():
+            codes, categories = pd.factorize(new_rows[col])
+            positions = {category: code for code, category in enumerate(categories)}
+
+            # Categorias que só aparecem nas linhas novas começam zeradas
+            for category in categories:
+                bitmaps.setdefault(category, np.packbits(np.zeros(self.n, dtype=bool)))
+
+            # Categorias ausentes nas linhas novas recebem apenas zeros
+            for category, bits in bitmaps.items():
+                bitmaps[category] = self._append_bits(bits, codes == positions.get(category, -2))
+
+        for col, bits in self.not_null.items():
+            self.not_null[col] = self._append_bits(bits, new_rows[col].notna().to_numpy())
+
+        self.n += len(new_rows)
+
+    def _append_bits(self, bits, new_bits):
+
+        # Com n múltiplo de 8 os bytes existentes são reaproveitados como estão
+        if self.n % 8 == 0:
+            return np.concatenate([bits, np.packbits(new_bits)])
+
+        return np.packbits(np.concatenate([np.unpackbits(bits, count=self.n), new_bits]))
+
+    # -------------------------------
+    # CONSULTA
+    # -------------------------------
+    def categories(self, col):
+
+        """Categorias indexadas da coluna, ordenadas"""
+
+        return sorted(self.bitmaps[col], key=str)
+
+    def combine(self, selection):
+
+        """
+        Combina as categorias escolhidas em um único bitmap.
+
+        Args:
+            selection (dict): {coluna: [categorias]}; colunas sem categorias são ignoradas
+
+        Retorna:
+            np.ndarray | None: bitmap compactado, ou None se não houver filtro
+        """
+
+        bits = None
+
+        for col, categories in selection.items():
+            if not categories:
+                continue
+
+            col_bits = np.bitwise_or.reduce([self.bitmaps[col][category] for category in categories])
+            bits = col_bits if bits is None else bits & col_bits
+
+        return bits
+
+    def column_mask(self, col, bits):
+
+        """
+        Máscara booleana (uma posição por linha) das linhas filtradas com valor na coluna.
+        Pronta para o parâmetro 'mask' de calculate_frequencies/calculate_statistics.
+        """
+
+        return np.unpackbits(bits & self.not_null[col], count=self.n).view(bool)
+
+    def count(self, bits):
+
+        """Quantidade de linhas selecionadas pelo bitmap"""
+
+        return int(np.unpackbits(bits, count=self.n).sum())
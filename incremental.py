@@ -0,0 +1,334 @@
+import copy
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+from utils import (
+    drop_missing,
+    build_frequency_table,
+    build_statistics_dict,
+    optimal_bins_for_range,
+    format_bins
+)
+
+# ==============================================
+# ESTADO INCREMENTAL POR COLUNA
+# ==============================================
+
+class ColumnAccumulator:
+
+    """
+    Estado de uma coluna que pode ser atualizado apenas com as linhas novas.
+
+    Guarda os valores distintos ordenados com suas contagens (mediana, quartis
+    e moda saem deles sem reler os dados), os momentos de Welford (média e
+    variância), e as contagens por classe de cada tipo quantitativo já exibido.
+
+    Os quantis são exatos, iguais aos de calculate_statistics, e por isso o
+    estado não é limitado: cada atualização custa O(linhas novas + valores
+    distintos). Em colunas discretas e qualitativas isso é pequeno; em colunas
+    contínuas quase sem repetições os valores distintos se aproximam de n, e o
+    custo (tempo e memória) de cada atualização também.
+    """
+
+    def __init__(self, col_data):
+
+        col_data = drop_missing(col_data)
+        self.numeric = pd.api.types.is_numeric_dtype(col_data)
+
+        # Valores distintos ordenados, suas contagens e a posição da primeira
+        # ocorrência (usada para desempatar a moda como statistics.mode faz)
+        self.values = np.empty(0, dtype=col_data.to_numpy().dtype)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.first_seen = np.empty(0, dtype=np.int64)
+        self._cumulative = None
+
+        # Momentos de Welford
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+        # var_type -> {'bins': limites, 'counts': contagem por classe}
+        self._bins = {}
+
+        self.update(col_data)
+
+    # -------------------------------
+    # ATUALIZAÇÃO
+    # -------------------------------
+    def update(self, delta):
+
+        """Incorpora as linhas novas da coluna"""
+
+        values = drop_missing(delta).to_numpy()
+
+        if len(values) == 0:
+            return
+
+        distinct, first_index, counts = np.unique(values, return_index=True, return_counts=True)
+        self._merge_counts(distinct, first_index + self.n, counts)
+
+        if self.numeric:
+            self._merge_moments(values.astype(float))
+
+        self.n += len(values)
+        self._update_bins(values)
+
+    def updated(self, delta):
+
+        """Cópia do acumulador com as linhas novas incorporadas (o original não é alterado)"""
+
+        staged = copy.copy(self)
+        staged.counts = self.counts.copy()
+        staged._bins = {var_type: dict(state, counts=state['counts'].copy()) for var_type, state in self._bins.items()}
+
+        staged.update(delta)
+        return staged
+
+    def _merge_counts(self, distinct, first_seen, counts):
+
+        # Ex: base com inteiros e atualização com decimais
+        dtype = np.result_type(self.values, distinct)
+        if self.values.dtype != dtype:
+            self.values = self.values.astype(dtype)
+
+        positions = np.searchsorted(self.values, distinct)
+        in_range = positions < len(self.values)
+        existing = np.zeros(len(distinct), dtype=bool)
+        existing[in_range] = self.values[positions[in_range]] == distinct[in_range]
+
+        # Valores já vistos: soma as contagens (a primeira ocorrência continua a antiga)
+        self.counts[positions[existing]] += counts[existing]
+
+        # Valores novos: inserção mantendo a ordem (O(valores distintos))
+        new = ~existing
+        self.values = np.insert(self.values, positions[new], distinct[new])
+        self.counts = np.insert(self.counts, positions[new], counts[new])
+        self.first_seen = np.insert(self.first_seen, positions[new], first_seen[new])
+        self._cumulative = None
+
+    def _merge_moments(self, values):
+
+        """Combina média e soma dos quadrados dos desvios do lote (Welford/Chan)"""
+
+        n_delta = len(values)
+        mean_delta = values.mean()
+        m2_delta = ((values - mean_delta) ** 2).sum()
+
+        total = self.n + n_delta
+        diff = mean_delta - self.mean
+
+        self.mean += diff * n_delta / total
+        self.m2 += m2_delta + diff ** 2 * self.n * n_delta / total
+
+    def _update_bins(self, delta_values):
+
+        """
+        Mantém as classes de cada tipo quantitativo já calculado.
+        Os limites só são recalculados quando mudam o mínimo, o máximo ou k = √n;
+        caso contrário apenas as linhas novas são somadas às classes existentes.
+        """
+
+        for var_type, state in self._bins.items():
+            bins = optimal_bins_for_range(self.n, self.values[0], self.values[-1], var_type)
+
+            if bins == state['bins']:
+                state['counts'] += _count_per_bin(delta_values, bins)
+            else:
+                state['bins'] = bins
+                state['counts'] = _count_per_bin(self.values, bins, self.counts)
+
+    @property
+    def nbytes(self):
+
+        """Memória ocupada pelo estado (arrays e, em colunas de texto, os valores distintos)"""
+
+        total = self.values.nbytes + self.counts.nbytes + self.first_seen.nbytes
+        total += sum(state['counts'].nbytes for state in self._bins.values())
+
+        if self.values.dtype == object:
+            total += sum(sys.getsizeof(value) for value in self.values)
+
+        return total
+
+    # -------------------------------
+    # RESULTADOS
+    # -------------------------------
+    def frequencies(self, var_type, col_data=None):
+
+        """
+        Mesmo dicionário de utils.calculate_frequencies, montado a partir do estado.
+        col_data (a coluna completa) só é repassada como 'plot_data' para os gráficos.
+        'categories' é None: não existe mais a categoria linha a linha.
+        """
+
+        if var_type.startswith("Quantitativa"):
+            if var_type not in self._bins:
+                bins = optimal_bins_for_range(self.n, self.values[0], self.values[-1], var_type)
+                self._bins[var_type] = {'bins': bins, 'counts': _count_per_bin(self.values, bins, self.counts)}
+
+            bins = self._bins[var_type]['bins']
+            formatted_bins = format_bins(bins)
+            freq = pd.Series(self._bins[var_type]['counts'], index=formatted_bins)
+            x_label = "Valores"
+        else:
+            bins = []
+            freq = pd.Series(self.counts, index=self.values)
+            formatted_bins = freq.index.astype(str).tolist()
+            x_label = "Categorias"
+
+        return {
+            'freq_table': build_frequency_table(freq),
+            'categories': None,
+            'formatted_bins': formatted_bins,
+            'plot_data': col_data,
+            'x_label': x_label,
+            'var_type': var_type,
+            'bins': bins
+        }
+
+    def statistics(self):
+
+        """Mesmo dicionário de utils.calculate_statistics, sem reler os dados"""
+
+        variancia = self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+        return build_statistics_dict(
+            media=self.mean,
+            mediana=self._median(),
+            moda=self._mode(),
+            q1=self._percentile(25),
+            q3=self._percentile(75),
+            amplitude=self.values[-1] - self.values[0],
+            variancia=variancia,
+            desvio=math.sqrt(variancia)
+        )
+
+    def _value_at(self, rank):
+
+        """Valor na posição 'rank' (base 0) dos dados ordenados"""
+
+        if self._cumulative is None:
+            self._cumulative = np.cumsum(self.counts)
+
+        return self.values[np.searchsorted(self._cumulative, rank, side='right')]
+
+    def _median(self):
+
+        middle = self.n // 2
+
+        if self.n % 2:
+            return self._value_at(middle)
+
+        return (self._value_at(middle - 1) + self._value_at(middle)) / 2
+
+    def _percentile(self, q):
+
+        """Interpolação linear, como o np.percentile padrão"""
+
+        position = (self.n - 1) * q / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, self.n - 1)
+
+        low_value = self._value_at(lower)
+        return low_value + (position - lower) * (self._value_at(upper) - low_value)
+
+    def _mode(self):
+
+        # Empate: o valor que apareceu primeiro, como statistics.mode
+        candidates = np.flatnonzero(self.counts == self.counts.max())
+        return self.values[candidates[np.argmin(self.first_seen[candidates])]]
+
+def _count_per_bin(values, bins, weights=None):
+
+    """Contagem por classe [a, b) — mesmo critério do pd.cut(right=False)"""
+
+    k = len(bins) - 1
+    index = np.searchsorted(bins, values, side='right') - 1
+    valid = (index >= 0) & (index < k)
+
+    if weights is not None:
+        weights = weights[valid]
+
+    return np.bincount(index[valid], weights=weights, minlength=k).astype(np.int64)
+
+# ==============================================
+# ANEXAÇÃO DE NOVAS LINHAS
+# ==============================================
+
+class IncrementalDataset:
+
+    """
+    Dataset que recebe arquivos de atualização (mesmas colunas do arquivo base).
+
+    Os acumuladores só são criados quando chega o primeiro arquivo (uma passada
+    sobre o dataset já anexado), para que sessões que nunca anexam nada não
+    paguem por eles. A partir daí são atualizados apenas com as linhas novas.
+    """
+
+    def __init__(self, dataset_key, df):
+
+        self.dataset_key = dataset_key
+        self.rows = len(df)
+        self.applied = set()
+
+        # Bytes ocupados pelos acumuladores (contados no orçamento da sessão)
+        self.nbytes = 0
+        self._columns = {}
+
+    def is_current(self, dataset_key, df):
+
+        """False se o dataset foi trocado ou recarregado do arquivo base"""
+
+        return self.dataset_key == dataset_key and self.rows == len(df)
+
+    def append(self, df, delta, delta_id):
+
+        """
+        Anexa as linhas de delta ao dataset e atualiza os acumuladores.
+        Retorna: o DataFrame resultante
+        """
+
+        if list(delta.columns) != list(df.columns):
+            raise ValueError("O arquivo de atualização deve ter as mesmas colunas do arquivo base")
+
+        for col in df.columns:
+            _check_column_type(col, df[col], delta[col])
+
+        merged = pd.concat([df, delta], ignore_index=True)
+
+        # Todas as colunas são atualizadas em cópias e só substituem o estado
+        # atual depois que nenhuma falhou: um delta rejeitado não deixa rastro
+        if self._columns:
+            staged = {col: accumulator.updated(delta[col]) for col, accumulator in self._columns.items()}
+        else:
+            staged = {col: ColumnAccumulator(merged[col]) for col in merged.columns}
+
+        self._columns = staged
+        self.nbytes = sum(accumulator.nbytes for accumulator in staged.values())
+        self.rows = len(merged)
+        self.applied.add(delta_id)
+
+        return merged
+
+    def accumulator(self, col):
+
+        """Acumulador da coluna, já atualizado com todas as linhas anexadas (após o primeiro append)"""
+
+        return self._columns[col]
+
+def _check_column_type(col, base, delta):
+
+    """ValueError se a coluna do delta não é do mesmo tipo (numérica ou não) que a do arquivo base"""
+
+    if pd.api.types.is_numeric_dtype(base) == pd.api.types.is_numeric_dtype(delta):
+        return
+
+    # Colunas só com ausentes são lidas como float e não dizem nada sobre o tipo
+    if delta.isna().all() or base.isna().all():
+        return
+
+    esperado = "numérica" if pd.api.types.is_numeric_dtype(base) else "texto"
+    raise ValueError(f"A coluna '{col}' deveria ser {esperado}, como no arquivo base")
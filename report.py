@@ -0,0 +1,190 @@
+import base64
+import html
+import io
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+# ==============================================
+# EXECUÇÃO EM SEGUNDO PLANO
+# ==============================================
+
+# Um único executor para o processo: a montagem do relatório roda fora da
+# thread do Streamlit, então a interface continua respondendo enquanto o
+# arquivo é gerado.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="relatorio")
+
+FORMATO_HTML = "HTML"
+FORMATO_ZIP = "HTML + Parquet (.zip)"
+
+def submit_report(results, formato=FORMATO_HTML, static_images=False):
+
+    """
+    Agenda a geração do relatório em segundo plano.
+
+    Args:
+        results (dict): Resultados já calculados por variável (ver build_html_report)
+        formato (str): FORMATO_HTML ou FORMATO_ZIP
+        static_images (bool): Se True, grava os gráficos como PNG (requer kaleido>=1 e Chrome)
+
+    Retorna:
+        Future: resolve para um dicionário com 'data', 'file_name' e 'mime'
+    """
+
+    # Cópia rasa: as tabelas e figuras não são alteradas depois de calculadas
+    snapshot = dict(results)
+
+    if formato == FORMATO_ZIP:
+        return _executor.submit(build_report_bundle, snapshot, static_images)
+
+    return _executor.submit(_build_html_file, snapshot, static_images)
+
+def results_signature(results):
+
+    """
+    Identifica o conteúdo dos resultados (variáveis, tipos e contagens), para
+    saber se um relatório já gerado ainda corresponde ao que está na tela.
+    """
+
+    return tuple(
+        (col, info['var_type'], tuple(info['freq_table']['Frequência Absoluta'].tolist()))
+        for col, info in results.items()
+    )
+
+def _build_html_file(results, static_images):
+
+    return {
+        'data': build_html_report(results, static_images).encode("utf-8"),
+        'file_name': "relatorio_analise.html",
+        'mime': "text/html"
+    }
+
+# ==============================================
+# RELATÓRIO HTML
+# ==============================================
+
+def build_html_report(results, static_images=False):
+
+    """
+    Monta um relatório HTML autocontido a partir dos resultados já calculados.
+
+    Args:
+        results (dict): {coluna: {'var_type', 'freq_table', 'stats', 'interpretation', 'figures'}}
+        static_images (bool): Gráficos como PNG embutido em vez de Plotly interativo
+
+    Retorna:
+        str: documento HTML completo
+    """
+
+    sections = [_render_section(col, info, static_images) for col, info in results.items()]
+
+    # O bundle do Plotly entra uma única vez, compartilhado por todos os gráficos
+    plotly_script = "" if static_images else f"<script type=\"text/javascript\">{get_plotlyjs()}</script>"
+
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Relatório de Análise Estatística</title>
+<style>
+body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #0e1117; color: #c7ebff; margin: 2rem; }}
+h1 {{ text-align: center; background-color: #262730; padding: 20px; border-radius: 10px; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5rem; }}
+th, td {{ padding: 4px 12px; text-align: center; border-bottom: 1px solid #262730; }}
+th {{ background-color: #172d43; }}
+img {{ max-width: 100%; }}
+</style>
+{plotly_script}
+</head>
+<body>
+<h1>Painel Interativo de Análise Estatística</h1>
+{''.join(sections)}
+</body>
+</html>
+"""
+
+def _render_section(col, info, static_images):
+
+    partes = [f"<hr><h2>Variável: <code>{html.escape(str(col))}</code></h2>"]
+    partes.append(f"<p><em>{html.escape(info['var_type'])}</em></p>")
+
+    partes.append("<h3>📋 Tabela de Frequência</h3>")
+    partes.append(info['freq_table'].to_html(float_format=lambda v: f"{v:.4g}", na_rep=""))
+
+    for fig in info.get('figures', []):
+        partes.append(_render_figure(fig, static_images))
+
+    if info.get('stats'):
+        partes.append("<h3>📊 Análise Estatística</h3>")
+        for grupo, medidas in info['stats'].items():
+            tabela = pd.DataFrame.from_dict(medidas, orient='index', columns=['Valor'])
+            tabela.index.name = grupo
+            partes.append(tabela.to_html())
+
+    if info.get('interpretation'):
+        partes.append("<h3>🧠 Interpretação dos Dados</h3>")
+        partes.extend(f"<p>{_markdown_bold(frase)}</p>" for frase in info['interpretation'])
+
+    return "\n".join(partes)
+
+def _render_figure(fig, static_images):
+
+    if static_images:
+        # kaleido>=1 usa um Chrome instalado (ver "plotly_get_chrome")
+        png = pio.to_image(fig, format="png")
+        return f"<img src=\"data:image/png;base64,{base64.b64encode(png).decode('ascii')}\">"
+
+    return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+
+def _markdown_bold(texto):
+
+    """Converte o negrito em markdown (**texto**) usado na interpretação para HTML"""
+
+    return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(texto))
+
+# ==============================================
+# PACOTE HTML + PARQUET
+# ==============================================
+
+def build_report_bundle(results, static_images=False):
+
+    """
+    Gera um .zip com o relatório HTML e as tabelas em Parquet (uma por variável).
+    """
+
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr("relatorio_analise.html", build_html_report(results, static_images))
+
+        for col, info in results.items():
+            nome = re.sub(r"[^\w\-]+", "_", str(col))
+
+            tabela = info['freq_table'].copy()
+            tabela.index = tabela.index.astype(str)
+            bundle.writestr(f"tabelas/{nome}_frequencias.parquet", _to_parquet(tabela))
+
+            if info.get('stats'):
+                linhas = [
+                    (grupo, medida, float(valor))
+                    for grupo, medidas in info['stats'].items()
+                    for medida, valor in medidas.items()
+                ]
+                estatisticas = pd.DataFrame(linhas, columns=['Grupo', 'Medida', 'Valor'])
+                bundle.writestr(f"tabelas/{nome}_estatisticas.parquet", _to_parquet(estatisticas))
+
+    return {
+        'data': buffer.getvalue(),
+        'file_name': "relatorio_analise.zip",
+        'mime': "application/zip"
+    }
+
+def _to_parquet(df):
+
+    buffer = io.BytesIO()
+    df.to_parquet(buffer)
+    return buffer.getvalue()
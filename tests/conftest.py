@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos da aplicação ficam na raiz do repositório
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils import load_csv  # noqa: E402
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "datas.csv")
+
+@pytest.fixture(params=[False, True], ids=["numpy", "arrow"])
+def arrow_backend(request):
+    return request.param
+
+@pytest.fixture
+def df(arrow_backend):
+    """Dataset de exemplo nos dois modos de carga (NumPy e Arrow)"""
+    return load_csv(DATASET, arrow_backend)
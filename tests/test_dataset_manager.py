@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from dataset_manager import DatasetManager, MB
+
+@pytest.fixture
+def manager(tmp_path):
+    return DatasetManager(global_budget=10 * MB, session_budget=10 * MB, spill_dir=str(tmp_path))
+
+def large_frame(rows=200_000):
+    return pd.DataFrame({'a': range(rows), 'b': [1.5] * rows})
+
+def test_spill_and_reload_roundtrip(manager, df):
+    manager.put("s1", "base", df)
+
+    # Força o spill do dataset de s1 pelo orçamento global
+    manager.global_budget = 1
+    manager.put("s2", "base", df.copy())
+    assert manager.usage("s1")['spilled_datasets'] == 1
+
+    manager.global_budget = 10 * MB
+    pdt.assert_frame_equal(manager.get("s1", "base"), df)
+
+def test_dataset_over_session_budget_is_memory_mapped(manager):
+    df = large_frame()
+    manager.session_budget = int(df.memory_usage(deep=True).sum()) // 2
+
+    loaded = manager.put("s1", "base", df)
+    usage = manager.usage("s1")
+
+    assert usage['session_bytes'] == 0
+    assert usage['session_mapped_bytes'] > 0
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in loaded.dtypes)
+    pdt.assert_frame_equal(loaded, df, check_dtype=False)
+
+def test_dataset_over_global_budget_is_memory_mapped(manager):
+    manager.global_budget = 1024
+    manager.put("s1", "base", large_frame())
+
+    assert manager.usage("s1")['global_bytes'] == 0
+    assert manager.usage("s1")['mapped_datasets'] == 1
+
+def test_owned_spill_dir_is_removed():
+    manager = DatasetManager()
+    spill_dir = manager.spill_dir
+
+    assert os.path.isdir(spill_dir)
+    del manager
+    assert not os.path.exists(spill_dir)
+
+def test_tracked_state_counts_in_session_budget(manager):
+    df = large_frame(1000)
+    nbytes = int(df.memory_usage(deep=True).sum())
+    manager.put("s1", "old", df)
+    manager.put("s1", "base", df.copy())
+
+    manager.session_budget = 2 * nbytes + 100
+    manager.track_state("s1", "base", 200)
+
+    # O estado não vai para o disco: o dataset menos usado da sessão é que sai da memória
+    usage = manager.usage("s1")
+    assert usage['session_state_bytes'] == 200
+    assert usage['session_bytes'] == nbytes + 200
+    assert usage['spilled_datasets'] == 1
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from filters import CategoryBitmapIndex
+from incremental import ColumnAccumulator
+from utils import calculate_frequencies, calculate_statistics
+
+QUANTITATIVE = ["Quantitativa Discreta", "Quantitativa Contínua"]
+
+def expected_mask(df, selection, col):
+    expected = df[col].notna().to_numpy(copy=True)
+    for filter_col, categories in selection.items():
+        expected &= df[filter_col].isin(categories).to_numpy()
+    return expected
+
+def test_combine_or_within_column_and_across_columns(df):
+    index = CategoryBitmapIndex("base", df)
+    selection = {
+        'Dispositivo_Principal': ["Smartphone", "Tablet"],
+        'Ativo_no_Mês': ["Sim"]
+    }
+
+    bits = index.combine(selection)
+
+    for col in df.columns:
+        np.testing.assert_array_equal(index.column_mask(col, bits), expected_mask(df, selection, col))
+    assert index.count(bits) == expected_mask(df, selection, 'Sexo').sum()
+
+def test_no_selection_means_no_filter(df):
+    index = CategoryBitmapIndex("base", df)
+    assert index.combine({'Sexo': []}) is None
+
+def test_extend_with_unaligned_appends(df):
+    index = CategoryBitmapIndex("base", df)
+    merged = df
+
+    # Tamanhos que deixam n fora de múltiplos de 8, com ausentes e uma categoria nova
+    for rows in (5, 3, 7):
+        delta = df.head(rows).copy()
+        delta.loc[delta.index[0], 'Dispositivo_Principal'] = None
+        delta.loc[delta.index[-1], 'Estado'] = "AM"
+        delta.index = range(len(merged), len(merged) + rows)
+
+        merged = pd.concat([merged, delta])
+        index.extend(delta)
+
+    assert index.n == len(merged)
+
+    for selection in (
+        {'Dispositivo_Principal': ["Smartphone"], 'Ativo_no_Mês': ["Sim"]},
+        {'Estado': ["AM", "PR"]},
+        {'Nível_de_Satisfação': ["Insatisfeito"], 'Sexo': ["Feminino", "Outro"]}
+    ):
+        bits = index.combine(selection)
+        for col in merged.columns:
+            np.testing.assert_array_equal(index.column_mask(col, bits), expected_mask(merged, selection, col))
+
+def test_masked_subsets_have_valid_classes(df):
+    """Regressão: subconjuntos filtrados pequenos geravam limites de classe repetidos"""
+
+    index = CategoryBitmapIndex("base", df)
+    numeric_columns = [col for col in df.columns if col not in index.bitmaps]
+
+    for filter_col in index.bitmaps:
+        for category in index.categories(filter_col):
+            bits = index.combine({filter_col: [category]})
+
+            for col in numeric_columns:
+                mask = index.column_mask(col, bits)
+                if not mask.any():
+                    continue
+
+                for var_type in QUANTITATIVE:
+                    freq_info = calculate_frequencies(df[col], var_type, mask=mask)
+                    counts = freq_info['freq_table']['Frequência Absoluta']
+
+                    assert len(set(freq_info['bins'])) == len(freq_info['bins'])
+                    assert counts.iloc[-1] == mask.sum()
+
+                    # O caminho incremental usa os mesmos limites e chega às mesmas contagens
+                    accumulator = ColumnAccumulator(df[col][mask])
+                    incremental_counts = accumulator.frequencies(var_type)['freq_table']['Frequência Absoluta']
+                    np.testing.assert_array_equal(incremental_counts.to_numpy(), counts.to_numpy())
+
+                calculate_statistics(df[col], mask=mask)
@@ -0,0 +1,139 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from incremental import IncrementalDataset
+from utils import (
+    drop_missing,
+    classify_variable,
+    calculate_frequencies,
+    calculate_statistics,
+    format_bins,
+    format_interval
+)
+
+def var_types(col_data):
+    if classify_variable(col_data).startswith("Quantitativa"):
+        return ["Quantitativa Discreta", "Quantitativa Contínua", "Qualitativa Nominal"]
+    return ["Qualitativa Nominal"]
+
+def assert_matches_full_recompute(incremental, merged):
+    for col in merged.columns:
+        col_data = drop_missing(merged[col])
+        accumulator = incremental.accumulator(col)
+
+        for var_type in var_types(col_data):
+            expected = calculate_frequencies(col_data, var_type)
+            result = accumulator.frequencies(var_type, col_data)
+
+            # No modo Arrow o pd.cut/value_counts devolve dtypes pyarrow; compara só os valores
+            pdt.assert_frame_equal(
+                result['freq_table'].astype("float64"),
+                expected['freq_table'].astype("float64"),
+                check_index_type=False
+            )
+            assert result['bins'] == expected['bins']
+
+        if var_types(col_data)[0].startswith("Quantitativa"):
+            expected = calculate_statistics(col_data)
+            result = accumulator.statistics()
+
+            for grupo, medidas in expected.items():
+                for medida, valor in medidas.items():
+                    assert result[grupo][medida] == pytest.approx(valor), (col, medida)
+
+def test_appends_match_full_recompute(df):
+    base, deltas = df.iloc[:10], [df.iloc[10:13], df.iloc[13:20], df.iloc[20:]]
+    incremental = IncrementalDataset("base", base)
+    merged = base
+
+    for number, delta in enumerate(deltas):
+        merged = incremental.append(merged, delta.reset_index(drop=True), f"delta_{number}")
+        assert_matches_full_recompute(incremental, merged)
+
+def test_append_with_missing_values_and_new_range(df):
+    incremental = IncrementalDataset("base", df)
+
+    delta = df.head(4).copy()
+    delta['Idade'] = delta['Idade'] * 3
+    delta['Tempo_Médio_Acesso (h/dia)'] = delta['Tempo_Médio_Acesso (h/dia)'] - 10
+    delta.loc[1, 'Avaliação_Final (0-10)'] = None
+    delta.loc[2, 'Estado'] = None
+
+    merged = incremental.append(df, delta, "delta")
+    assert_matches_full_recompute(incremental, merged)
+
+def test_class_edges_kept_when_range_and_k_unchanged(df):
+    col = 'Avaliação_Final (0-10)'
+    incremental = IncrementalDataset("base", df.iloc[:23])
+    base = incremental.append(df.iloc[:23], df.iloc[23:24].reset_index(drop=True), "delta_0")
+    bins = incremental.accumulator(col).frequencies("Quantitativa Contínua")['bins']
+
+    # Um valor dentro do intervalo atual com k = round(√25) = round(√24): mesmos limites
+    delta = df.iloc[[0]].reset_index(drop=True)
+    merged = incremental.append(base, delta, "delta_1")
+
+    assert incremental.accumulator(col).frequencies("Quantitativa Contínua")['bins'] is bins
+    assert_matches_full_recompute(incremental, merged)
+
+def test_accumulators_built_on_first_append(df):
+    incremental = IncrementalDataset("base", df)
+    assert incremental.nbytes == 0
+
+    merged = incremental.append(df, df.head(2).reset_index(drop=True), "delta")
+
+    assert incremental.nbytes > 0
+    assert_matches_full_recompute(incremental, merged)
+
+def test_append_rejects_different_columns(df):
+    incremental = IncrementalDataset("base", df)
+
+    with pytest.raises(ValueError):
+        incremental.append(df, df.drop(columns=['Sexo']), "delta")
+
+    assert not incremental.applied
+    assert incremental.rows == len(df)
+
+@pytest.mark.parametrize("col, values", [('Estado', [11, 35]), ('Idade', ["vinte", "trinta"])])
+def test_append_rejects_column_type_change_without_partial_update(df, col, values):
+    incremental = IncrementalDataset("base", df.iloc[:18])
+    base = incremental.append(df.iloc[:18], df.iloc[18:20].reset_index(drop=True), "delta_0")
+    snapshot = lambda accumulator: (
+        accumulator.n,
+        accumulator.frequencies("Qualitativa Nominal")['freq_table'].copy()
+    )
+    before = {name: snapshot(incremental.accumulator(name)) for name in df.columns}
+
+    delta = df.iloc[20:22].reset_index(drop=True)
+    delta[col] = values
+
+    # Duas tentativas, como em dois reruns com o arquivo ainda no uploader
+    for _ in range(2):
+        with pytest.raises(ValueError, match=col):
+            incremental.append(base, delta, "delta_1")
+
+    assert incremental.applied == {"delta_0"}
+    assert incremental.rows == 20
+
+    for name, (n, freq_table) in before.items():
+        after = snapshot(incremental.accumulator(name))
+        assert after[0] == n, name
+        pdt.assert_frame_equal(after[1], freq_table)
+
+def test_append_accepts_column_with_only_missing_values(df):
+    incremental = IncrementalDataset("base", df)
+
+    delta = df.head(3).copy()
+    delta['Estado'] = float("nan")
+
+    merged = incremental.append(df, delta, "delta")
+    assert_matches_full_recompute(incremental, merged)
+
+def test_class_labels_match_pd_cut_rounding():
+    bins = [22.82, 28.0849999, 33.3]
+    col_data = pd.Series([23.0, 25.0, 30.0])
+
+    expected = pd.cut(col_data, bins=bins, right=False, include_lowest=True).value_counts().sort_index().index
+    expected = [format_interval(interval) for interval in expected]
+
+    assert format_bins(bins) == expected == ['22.82 | - 28.09', '28.09 | - 33.30']
@@ -0,0 +1,93 @@
+import io
+import re
+import zipfile
+
+import pandas as pd
+import pytest
+from plotly.offline import get_plotlyjs
+
+import report
+from components import build_distribution_figure
+from report import build_html_report, build_report_bundle, results_signature, _markdown_bold
+from utils import (
+    drop_missing,
+    calculate_frequencies,
+    calculate_statistics,
+    generate_interpretation
+)
+
+COLUMNS = {
+    'Idade': "Quantitativa Discreta",
+    'Tempo_Médio_Acesso (h/dia)': "Quantitativa Contínua",
+    'Sexo': "Qualitativa Nominal"
+}
+
+@pytest.fixture
+def results(df):
+    results = {}
+
+    for col, var_type in COLUMNS.items():
+        freq_info = calculate_frequencies(drop_missing(df[col]), var_type)
+        result = results[col] = {
+            'var_type': var_type,
+            'freq_table': freq_info['freq_table'],
+            'figures': [build_distribution_figure(freq_info, col)],
+            'stats': None,
+            'interpretation': []
+        }
+
+        if var_type.startswith("Quantitativa"):
+            result['stats'] = calculate_statistics(drop_missing(df[col]))
+            result['interpretation'] = generate_interpretation(result['stats'], col)
+
+    return results
+
+def test_plotly_bundle_included_once(results):
+    document = build_html_report(results)
+    assert document.count(get_plotlyjs()) == 1
+
+def test_static_images_skip_plotly_bundle(results, monkeypatch):
+    # A exportação real do PNG precisa do Chrome (kaleido>=1); aqui só importa o HTML
+    monkeypatch.setattr(report.pio, "to_image", lambda fig, format: b"png")
+
+    document = build_html_report(results, static_images=True)
+
+    assert get_plotlyjs() not in document
+    assert document.count("data:image/png;base64,") == len(results)
+
+def test_bundle_has_readable_parquet_tables(results):
+    bundle = zipfile.ZipFile(io.BytesIO(build_report_bundle(results)['data']))
+
+    assert "relatorio_analise.html" in bundle.namelist()
+
+    for col, info in results.items():
+        nome = re.sub(r"[^\w\-]+", "_", col)
+
+        frequencias = pd.read_parquet(io.BytesIO(bundle.read(f"tabelas/{nome}_frequencias.parquet")))
+        assert frequencias['Frequência Absoluta'].tolist() == info['freq_table']['Frequência Absoluta'].tolist()
+
+        if info['stats']:
+            estatisticas = pd.read_parquet(io.BytesIO(bundle.read(f"tabelas/{nome}_estatisticas.parquet")))
+            assert len(estatisticas) == sum(len(medidas) for medidas in info['stats'].values())
+            assert estatisticas.loc[estatisticas['Medida'] == 'Média', 'Valor'].item() == pytest.approx(
+                info['stats']['Medidas de Posição']['Média']
+            )
+
+def test_markdown_bold_escapes_text():
+    assert _markdown_bold("A média de **<Idade>** é 3 & 4") == (
+        "A média de <strong>&lt;Idade&gt;</strong> é 3 &amp; 4"
+    )
+    assert _markdown_bold("**x** e **y**") == "<strong>x</strong> e <strong>y</strong>"
+
+def test_signature_changes_with_type_or_counts(results):
+    signature = results_signature(results)
+
+    changed_type = {**results, 'Idade': {**results['Idade'], 'var_type': "Quantitativa Contínua"}}
+    assert results_signature(changed_type) != signature
+
+    freq_table = results['Sexo']['freq_table'].copy()
+    freq_table.iloc[0, 0] += 1
+    changed_counts = {**results, 'Sexo': {**results['Sexo'], 'freq_table': freq_table}}
+    assert results_signature(changed_counts) != signature
+
+    assert results_signature(dict(results)) == signature
@@ -0,0 +1,33 @@
+import statistics
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import drop_missing, classify_variable, calculate_statistics, first_mode
+
+def test_statistics_match_python_statistics(df):
+    for col in df.columns:
+        col_data = drop_missing(df[col])
+        if not classify_variable(col_data).startswith("Quantitativa"):
+            continue
+
+        values = col_data.tolist()
+        posicao = calculate_statistics(col_data)['Medidas de Posição']
+
+        assert posicao['Média'] == pytest.approx(statistics.mean(values))
+        assert posicao['Mediana'] == pytest.approx(statistics.median(values))
+        assert posicao['Moda'] == statistics.mode(values)
+
+def test_first_mode_breaks_ties_by_first_occurrence():
+    assert first_mode(np.array([3, 1, 1, 3, 2])) == 3
+    assert first_mode(np.array([2.5, 7.0, 7.0, 2.5])) == 2.5
+
+@pytest.mark.parametrize("values", [np.array([7]), np.array([4, 1, 3, 2]), np.array([2.5, 0.1, 9.0, 2.5, 4.75])])
+def test_quartiles_match_numpy_percentile(values):
+    posicao = calculate_statistics(pd.Series(values))['Medidas de Posição']
+
+    q1, mediana, q3 = np.percentile(values, [25, 50, 75])
+    assert posicao['Primeiro Quartil [Q1]'] == pytest.approx(q1)
+    assert posicao['Mediana'] == pytest.approx(mediana)
+    assert posicao['Terceiro Quartil [Q3]'] == pytest.approx(q3)
@@ -1,8 +1,44 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 from scipy import stats
 import math
-import statistics
+
+# ==============================================
+# CARREGAMENTO DOS DADOS
+# ==============================================
+
+def load_csv(source, arrow_backend=False):
+
+    """
+    Lê o CSV (decimal com vírgula) e descarta a primeira coluna (identificação).
+
+    Com arrow_backend=True o arquivo é lido direto para uma tabela Arrow e o
+    DataFrame devolvido usa dtypes pyarrow apontando para os mesmos buffers:
+    não há conversão para NumPy na carga nem na serialização do st.dataframe.
+    """
+
+    if arrow_backend:
+        table = pa_csv.read_csv(source, convert_options=pa_csv.ConvertOptions(decimal_point=","))
+
+        # select() não copia; combine_chunks() consolida cada coluna uma única vez,
+        # para que as conversões seguintes (ex: to_numpy) sejam zero-copy
+        table = table.select(table.column_names[1:]).combine_chunks()
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    df = pd.read_csv(source, decimal=",")
+
+    # drop() gera um DataFrame independente; com iloc[:, 1:] a visão manteria
+    # o original inteiro vivo
+    return df.drop(columns=df.columns[0])
+
+def drop_missing(col_data):
+
+    """dropna() apenas quando há valores ausentes, evitando copiar colunas completas"""
+
+    return col_data.dropna() if col_data.hasnans else col_data
 
 # ==============================================
 # CLASSIFICAÇÃO E CATEGORIZAÇÃO
@@ -16,18 +52,26 @@ def classify_variable(col_data):
     - Qualitativa Ordinal
     - Qualitativa Nominal
     """
-    col_data = col_data.dropna()
+    col_data = drop_missing(col_data)
     n_unique = col_data.nunique()
     
     # Verifica se é numérica
     is_numeric = pd.api.types.is_numeric_dtype(col_data)
 
     if is_numeric:
-        # Converte para numpy array
-        values = col_data.to_numpy()
+        if isinstance(col_data.dtype, pd.ArrowDtype):
+            # Dtypes pyarrow: verifica direto nos buffers Arrow, sem converter para NumPy
+            all_integers = pa.types.is_integer(col_data.dtype.pyarrow_dtype)
 
-        # Verifica se todos os valores são inteiros (mesmo que estejam como float)
-        all_integers = np.all(np.equal(np.mod(values, 1), 0))
+            if not all_integers:
+                arrow_values = pa.array(col_data)
+                all_integers = pc.all(pc.equal(pc.floor(arrow_values), arrow_values)).as_py()
+        else:
+            # Converte para numpy array
+            values = col_data.to_numpy()
+
+            # Verifica se todos os valores são inteiros (mesmo que estejam como float)
+            all_integers = np.all(np.equal(np.mod(values, 1), 0))
 
         if all_integers and n_unique < 30:
             return "Quantitativa Discreta"
@@ -49,10 +93,12 @@ def classify_variable(col_data):
 
     return "Qualitativa Nominal"
 
-def calculate_frequencies(col_data, var_type):
+def calculate_frequencies(col_data, var_type, mask=None):
 
     """
     Calcula tabela de frequências conforme o tipo de variável.
+    mask (opcional): vetor booleano alinhado às posições de col_data; só as linhas
+    marcadas entram no cálculo (ex: filtros de filters.CategoryBitmapIndex).
 
     Retorna:
     - freq_table: DataFrame com todas as frequências
@@ -63,6 +109,9 @@ def calculate_frequencies(col_data, var_type):
     - bins: lista com os limites dos intervalos calculados (ex: [10, 15, 20])
     """
 
+    if mask is not None:
+        col_data = col_data[mask]
+
     # Inicializa variáveis gerais
     categories = None
     formatted_bins = [] 
@@ -108,10 +157,30 @@ def calculate_frequencies(col_data, var_type):
         # Rótulos como strings (para exibição)
         formatted_bins = freq.index.astype(str).tolist()
 
-        # Dados como string para consistência na plotagem
-        plot_data = col_data.astype(str)
+        # Dados como string para consistência na plotagem (sem cópia se já forem texto)
+        plot_data = col_data if pd.api.types.is_string_dtype(col_data) else col_data.astype(str)
         x_label = "Categorias"
 
+    # -------------------------------
+    # RETORNO DA FUNÇÃO
+    # -------------------------------
+    return {
+        'freq_table': build_frequency_table(freq),
+        'categories': categories,
+        'formatted_bins': formatted_bins,
+        'plot_data': plot_data,
+        'x_label': x_label,
+        'var_type': var_type,
+        'bins': bins  
+    }
+
+def build_frequency_table(freq):
+
+    """
+    Monta a tabela de frequências (absoluta, relativa e acumulada, com linha de total)
+    a partir da contagem por categoria/classe.
+    """
+
     # -------------------------------
     # CÁLCULOS DE FREQUÊNCIAS (valem para ambos os tipos)
     # -------------------------------
@@ -137,29 +206,20 @@ def calculate_frequencies(col_data, var_type):
         'Frequência Acumulativa [%]': [np.nan]
     }, index=['Total'])
 
-    freq_table = pd.concat([freq_table, total_row])
-
-    # -------------------------------
-    # RETORNO DA FUNÇÃO
-    # -------------------------------
-    print(freq_table)
-    return {
-        'freq_table': freq_table,
-        'categories': categories,
-        'formatted_bins': formatted_bins,
-        'plot_data': plot_data,
-        'x_label': x_label,
-        'var_type': var_type,
-        'bins': bins  
-    }
+    return pd.concat([freq_table, total_row])
 
 def calculate_optimal_bins(col_data, var_type):
 
-    n = len(col_data)
+    return optimal_bins_for_range(len(col_data), col_data.min(), col_data.max(), var_type)
+
+def optimal_bins_for_range(n, min_val, max_val, var_type):
+
+    """Limites das classes a partir apenas de n, mínimo e máximo (k = √n classes)"""
+
     k = round(math.sqrt(n))
     
-    min_val = float(col_data.min())
-    max_val = float(col_data.max())
+    min_val = float(min_val)
+    max_val = float(max_val)
     
     amplitude_total = max_val - min_val
     
@@ -169,6 +229,12 @@ def calculate_optimal_bins(col_data, var_type):
         min_val = int(min_val)
         max_val = int(max_val)
         amplitude_total = max_val - min_val
+
+        # Menos valores inteiros possíveis do que classes (ex: subconjuntos filtrados):
+        # uma classe por valor, pois um passo menor que 1 repetiria limites
+        if k > amplitude_total:
+            return list(range(min_val, max_val + 2))
+
         intervalo = amplitude_total / k
         
         # Garantir que os bins sejam inteiros e cubram todo o intervalo
@@ -177,6 +243,10 @@ def calculate_optimal_bins(col_data, var_type):
          # Inclui o último valor
         bins[-1] = max_val + 1 
     else:
+        # Todos os valores iguais: uma única classe (senão os limites se repetiriam)
+        if amplitude_total == 0:
+            k = 1
+
         # Variável contínua (pode ter valores float)
         intervalo = amplitude_total / k
         bins = [min_val + i * intervalo for i in range(k + 1)]
@@ -186,6 +256,13 @@ def calculate_optimal_bins(col_data, var_type):
     
     return bins
 
+def format_bins(bins):
+
+    """Rótulos 'a | - b' das classes, com o mesmo arredondamento que o pd.cut aplica aos limites"""
+
+    intervals = pd.cut(np.array([], dtype=float), bins=bins, right=False, include_lowest=True).categories
+    return [format_interval(interval) for interval in intervals]
+
 def format_interval(interval):
 
     """Formata intervalo no estilo 'a.b | - b.c' com 2 casas decimais"""
@@ -198,28 +275,126 @@ def format_interval(interval):
 # ESTATÍSTICAS DESCRITIVAS
 # ==============================================
 
-def calculate_statistics(col_data):
+def calculate_statistics(col_data, mask=None):
 
     """
     Calcula estatísticas descritivas para variáveis quantitativas
+    mask (opcional): vetor booleano alinhado às posições de col_data (ver calculate_frequencies)
     Retorna: Dicionário organizado para criação de tabela
     """
+
+    if mask is not None:
+        col_data = col_data[mask]
+
+    # Uma única conversão para NumPy (zero-copy para colunas sem ausentes),
+    # reaproveitada por todas as medidas abaixo
+    values = col_data.to_numpy()
+
+    # Uma única cópia ordenada serve para os quartis, a mediana, a amplitude e a moda
+    ordered = np.sort(values)
+    q1, mediana, q3 = sorted_percentiles(ordered, [25, 50, 75])
+    variancia = np.var(values, ddof=1)
+
+    return build_statistics_dict(
+        media=np.mean(values),
+        mediana=mediana,
+        moda=first_mode(values, ordered),
+        q1=q1,
+        q3=q3,
+        amplitude=ordered[-1] - ordered[0],
+        variancia=variancia,
+        desvio=np.sqrt(variancia)
+    )
+
+def sorted_percentiles(ordered, percentiles):
+
+    """Percentis de um vetor já ordenado, com a interpolação linear do np.percentile (sem nova cópia)"""
+
+    positions = (len(ordered) - 1) * np.asarray(percentiles, dtype=float) / 100
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (positions - lower) * (ordered[upper] - ordered[lower])
+
+def first_mode(values, ordered=None):
+
+    """
+    Moda; em caso de empate, o valor que aparece primeiro (como statistics.mode)
+    ordered (opcional): values já ordenado, para não ordenar de novo
+    """
+
+    if ordered is None:
+        ordered = np.sort(values)
+
+    # Início de cada sequência de valores iguais no vetor ordenado
+    starts = np.concatenate(([0], np.flatnonzero(ordered[1:] != ordered[:-1]) + 1))
+    counts = np.diff(np.append(starts, len(ordered)))
+    candidates = ordered[starts[counts == counts.max()]]
+
+    if len(candidates) == 1:
+        return candidates[0]
+
+    # Empate: o candidato que aparece primeiro nos dados
+    return values[np.argmax(np.isin(values, candidates))]
+
+def build_statistics_dict(media, mediana, moda, q1, q3, amplitude, variancia, desvio):
+
+    """Organiza as medidas já calculadas no dicionário usado pelas tabelas e pela interpretação"""
+
     stats_dict = {
         'Medidas de Posição': {
-            'Média': statistics.mean(col_data),
-            'Mediana': statistics.median(col_data),
-            'Moda': statistics.mode(col_data),
-            'Primeiro Quartil [Q1]': np.percentile(col_data, 25),
-            'Terceiro Quartil [Q3]': np.percentile(col_data, 75)
+            'Média': media,
+            'Mediana': mediana,
+            'Moda': moda,
+            'Primeiro Quartil [Q1]': q1,
+            'Terceiro Quartil [Q3]': q3
         },
         
         'Medidas de Dispersão': {
-            'Amplitude': np.ptp(col_data),
-            'Variância': np.var(col_data, ddof=1),
-            'Desvio Padrão': np.std(col_data, ddof=1),
-            'Coeficiente de Variação (CV)': (np.std(col_data, ddof=1) / statistics.mean(col_data)) 
-                                       if statistics.mean(col_data) != 0 else np.nan
+            'Amplitude': amplitude,
+            'Variância': variancia,
+            'Desvio Padrão': desvio,
+            'Coeficiente de Variação (CV)': (desvio / media) 
+                                       if media != 0 else np.nan
         }
     }
     
-    return stats_dict
\ No newline at end of file
+    return stats_dict
+
+# ==============================================
+# INTERPRETAÇÃO DOS RESULTADOS
+# ==============================================
+
+def generate_interpretation(stats_dict, col_name):
+
+    """
+    Gera o texto de interpretação das estatísticas descritivas.
+    Retorna: Lista de frases (em markdown), usada tanto na tela quanto no relatório exportado
+    """
+
+    media = stats_dict["Medidas de Posição"].get("Média", None)
+    mediana = stats_dict["Medidas de Posição"].get("Mediana", None)
+    moda = stats_dict["Medidas de Posição"].get("Moda", None)
+    desvio = stats_dict["Medidas de Dispersão"].get("Desvio Padrão", None)
+    amplitude = stats_dict["Medidas de Dispersão"].get("Amplitude", None)
+
+    frases = []
+
+    if media and mediana:
+        if abs(media - mediana) < 0.1 * media:
+            frases.append(f"A média e a mediana da variável **{col_name}** são próximas ({media:.2f} e {mediana:.2f}), indicando uma distribuição aproximadamente simétrica.")
+        elif media > mediana:
+            frases.append(f"A média ({media:.2f}) é maior que a mediana ({mediana:.2f}), sugerindo que a distribuição da variável **{col_name}** pode estar **assimétrica à direita**.")
+        else:
+            frases.append(f"A média ({media:.2f}) é menor que a mediana ({mediana:.2f}), sugerindo que a distribuição da variável **{col_name}** pode estar **assimétrica à esquerda**.")
+
+    if desvio:
+        frases.append(f"O desvio padrão é de **{desvio:.2f}**, o que indica o grau de dispersão dos dados em relação à média.")
+
+    if amplitude:
+        frases.append(f"A amplitude total dos dados é de **{amplitude:.2f}**, representando a diferença entre o maior e o menor valor observado.")
+
+    if moda is not None:
+        frases.append(f"A moda dos dados é **{moda}**, ou seja, o valor que ocorre com mais frequência na variável **{col_name}**.")
+
+    return frases